@@ -2,13 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
+import io
 import json
 import os
+import random
+import re
 import sys
+import threading
 import time
 import urllib.parse
+import weakref
+from array import array
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import aiohttp
 import discord
@@ -39,27 +47,290 @@ class BotConfig:
 
         self.guild = discord.Object(id=self.guild_id)
 
+        self.audio_mode = os.getenv("AUDIO_MODE", "opus").lower()
+        if self.audio_mode not in ("opus", "pcm"):
+            raise ValueError("AUDIO_MODE must be either 'opus' or 'pcm'.")
+        self.audio_bitrate = self._get_int("AUDIO_BITRATE", 128)
+        self.buffer_seconds = self._get_int("BUFFER_SECONDS", 5)
+        self.stream_url_ttl = self._get_int("STREAM_URL_TTL", 600)
+        self.edit_concurrency = self._get_int("EDIT_CONCURRENCY", 4)
+        self.presence_interval = self._get_int("PRESENCE_INTERVAL", 15)
+        self.idle_timeout = self._get_int("IDLE_TIMEOUT", 300)
+        self.soft_stop_timeout = self._get_int("SOFT_STOP_TIMEOUT", 0)
+        self.persistent_player = self._get_bool("PERSISTENT_PLAYER", False)
+        self.player_state_file = os.getenv("PLAYER_STATE_FILE", "player_messages.json")
+
+    @staticmethod
+    def _get_bool(name: str, default: bool) -> bool:
+        value = os.getenv(name)
+        if value is None:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    @staticmethod
+    def _get_int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, default))
+        except ValueError:
+            raise ValueError(f"{name} must be a valid integer.")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class Upstream:
+    """Request policy for one upstream host.
+
+    Each upstream gets its own session with connect/read timeouts and a
+    connector tuned for it. Transport errors, 5xx and 429 responses are
+    retried a bounded number of times with jittered exponential backoff.
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    calls fail fast with :class:`CircuitOpenError` for ``reset_timeout``
+    seconds, so callers fall back to cached data instead of hanging.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect_timeout: float = 3,
+        read_timeout: float = 5,
+        retries: int = 1,
+        backoff: float = 0.5,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30,
+        limit_per_host: int = 4,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+    ) -> None:
+        self.name = name
+        self.timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+        self.requests = 0
+        self.retried = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def open(self) -> None:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def call(self, request: Callable[[aiohttp.ClientSession], Any]) -> Any:
+        """Run ``request(session)`` under this upstream's policy."""
+        if self.state == "open":
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} is unavailable")
+
+        for attempt in range(self.retries + 1):
+            self.requests += 1
+            try:
+                result = await request(self.session)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not self._retryable(e):
+                    raise
+                if attempt == self.retries or self.state != "closed":
+                    self._record_failure()
+                    raise
+                self.retried += 1
+                await asyncio.sleep(
+                    self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+                )
+            else:
+                if self._opened_at is not None:
+                    logger.info(f"Circuit for {self.name} closed.")
+                self._failures = 0
+                self._opened_at = None
+                return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "requests": self.requests,
+            "retried": self.retried,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status == 429
+        return True
+
+    def _record_failure(self) -> None:
+        self.failed += 1
+        self._failures += 1
+        if self._failures >= self.failure_threshold or self._opened_at is not None:
+            if self._opened_at is None:
+                logger.warning(f"Circuit for {self.name} opened.")
+            self._opened_at = time.monotonic()
+
+
+class MetadataCache:
+    """Bounded LRU cache of iTunes lookups with separate TTLs for hits and misses.
+
+    Titles without a match (jingles, station IDs, ads) are cached as misses so
+    they are not looked up again on every repeat, failed lookups are cached
+    briefly, and concurrent lookups for the same title share one request.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        hit_ttl: float = 6 * 3600,
+        miss_ttl: float = 30 * 60,
+        error_ttl: float = 60,
+    ) -> None:
+        self.maxsize = maxsize
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.error_ttl = error_ttl
+
+        # key -> (expires_at, song, whether the entry stems from a failed lookup)
+        self._entries: OrderedDict[str, tuple[float, Optional[dict], bool]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.casefold().split())
+
+    async def get(self, query: str, lookup: Callable[[], Any]) -> Optional[dict]:
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            if entry[1] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._load(key, lookup))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def peek(self, query: str) -> tuple[bool, Optional[dict]]:
+        """Return ``(found, song)`` from the cache without looking anything up."""
+        entry = self._entries.get(self.normalize(query))
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def failed(self, query: str) -> bool:
+        """Whether the cached entry for ``query`` stems from a failed lookup."""
+        entry = self._entries.get(self.normalize(query))
+        return bool(entry and entry[2])
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+    async def _load(self, key: str, lookup: Callable[[], Any]) -> Optional[dict]:
+        failed = False
+        try:
+            song = await lookup()
+            ttl = self.hit_ttl if song else self.miss_ttl
+        except Exception as e:
+            failed = True
+            logger.error(f"Error fetching iTunes data: {e}")
+            self.errors += 1
+            # Keep serving an expired entry while the lookup keeps failing.
+            stale = self._entries.get(key)
+            song, ttl = (stale[1] if stale else None), self.error_ttl
+
+        self._entries[key] = (time.monotonic() + ttl, song, failed)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return song
+
 
 @dataclass
 class SongMetadata:
     query: str
-    session: aiohttp.ClientSession
+    upstream: Upstream
+    cache: Optional[MetadataCache] = None
 
     BASE_URL: str = "https://itunes.apple.com/search"
 
     async def fetch(self) -> dict:
         try:
-            async with self.session.get(
-                self.BASE_URL,
-                params={"term": self.query, "media": "music", "limit": "1"},
-                headers={"Accept": "application/json"},
-            ) as response:
-                return await response.json(content_type=None)
+            return await self._search()
         except Exception as e:
             logger.error(f"Error fetching iTunes data: {e}")
             return {"results": []}
 
+    async def _search(self) -> dict:
+        return await self.upstream.call(self._request)
+
+    async def _request(self, session: aiohttp.ClientSession) -> dict:
+        async with session.get(
+            self.BASE_URL,
+            params={"term": self.query, "media": "music", "limit": "1"},
+            headers={"Accept": "application/json"},
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _search_song(self) -> Optional[dict]:
+        data = await self._search()
+        return data["results"][0] if data.get("results") else None
+
     async def get_song(self) -> Optional[dict]:
+        if self.cache:
+            return await self.cache.get(self.query, self._search_song)
+
         try:
             data = await self.fetch()
             return data["results"][0] if data.get("results") else None
@@ -67,15 +338,1487 @@ class SongMetadata:
             logger.error(f"Error parsing song data: {e}")
             return
 
-    @property
-    async def artwork(self) -> str | False:
-        song = await self.get_song()
+    @staticmethod
+    def artwork_url(song: Optional[dict]) -> str | False:
         if not song:
             return False
         return song.get(
             "artworkUrl100", song.get("artworkUrl60", song.get("artworkUrl30", False))
         )
 
+    @property
+    async def artwork(self) -> str | False:
+        return self.artwork_url(await self.get_song())
+
+    @property
+    def cached_artwork(self) -> Optional[str | False]:
+        """Artwork from the cache, or ``None`` if the title hasn't been looked up."""
+        if not self.cache:
+            return None
+        found, song = self.cache.peek(self.query)
+        return self.artwork_url(song) if found else None
+
+
+class OpusFrameRing:
+    """Preallocated ring buffer holding the last few seconds of encoded Opus frames.
+
+    Every slot is reserved up front, so memory stays at ``capacity * frame_size``
+    bytes no matter how far behind a reader falls. Readers that are overrun
+    resynchronise on the live edge instead of holding frames back, and frames
+    that were discarded are never handed out again.
+    """
+
+    MAX_FRAME_SIZE: int = 4000
+
+    def __init__(self, seconds: float = 5.0, frame_size: int = MAX_FRAME_SIZE) -> None:
+        self.capacity = max(1, int(seconds * 1000 / discord.opus.Encoder.FRAME_LENGTH))
+        self.frame_size = frame_size
+
+        self._buffer = bytearray(self.capacity * frame_size)
+        self._view = memoryview(self._buffer)
+        self._lengths = array("H", bytes(2 * self.capacity))
+        self._sequence = 0
+        self._floor = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._writer: Optional[object] = None
+        self.published_at = time.monotonic()
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer) + self._lengths.itemsize * len(self._lengths)
+
+    def discard(self) -> None:
+        """Drop every buffered frame; readers resume with the next published one."""
+        with self._condition:
+            self._floor = self._sequence
+
+    def set_writer(self, writer: Optional[object]) -> None:
+        """Hand the ring over to ``writer``; frames of any other writer are dropped.
+
+        The handover happens under the ring lock, so always between two frames.
+        """
+        with self._condition:
+            self._writer = writer
+            self.published_at = time.monotonic()
+
+    def publish(self, frame: bytes, writer: Optional[object] = None) -> None:
+        size = len(frame)
+        if size > self.frame_size:
+            logger.warning(f"Dropping oversized Opus frame ({size} bytes).")
+            return
+
+        with self._condition:
+            if writer is not None and writer is not self._writer:
+                return
+            self.published_at = time.monotonic()
+            sequence = self._sequence + 1
+            slot = sequence % self.capacity
+            offset = slot * self.frame_size
+            self._view[offset : offset + size] = frame
+            self._lengths[slot] = size
+            self._sequence = sequence
+            self._condition.notify_all()
+
+    def read(self, cursor: int, timeout: float) -> tuple[int, Optional[bytes]]:
+        """Return the frame following ``cursor`` together with its sequence number.
+
+        ``None`` is returned on timeout or once the ring is closed.
+        """
+        with self._condition:
+            cursor = max(cursor, self._floor)
+            self._condition.wait_for(
+                lambda: self._closed or self._sequence > cursor, timeout
+            )
+            if self._sequence <= cursor:
+                return cursor, None
+
+            sequence = cursor + 1
+            if self._sequence - sequence >= self.capacity:
+                sequence = self._sequence
+
+            slot = sequence % self.capacity
+            offset = slot * self.frame_size
+            return sequence, bytes(self._view[offset : offset + self._lengths[slot]])
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class IcyMetadataParser:
+    """Splits an ICY stream into audio bytes and ``StreamTitle`` updates."""
+
+    TITLE_PATTERN = re.compile(r"StreamTitle='(.*?)';", re.DOTALL)
+
+    def __init__(self, metaint: int) -> None:
+        self.metaint = metaint
+        self._remaining = metaint
+        self._meta_length: Optional[int] = None
+        self._meta = bytearray()
+
+    def feed(self, chunk: bytes) -> tuple[bytes, list[str]]:
+        audio = bytearray()
+        titles: list[str] = []
+        view = memoryview(chunk)
+        position = 0
+
+        while position < len(chunk):
+            if self._remaining:
+                size = min(self._remaining, len(chunk) - position)
+                audio += view[position : position + size]
+                position += size
+                self._remaining -= size
+            elif self._meta_length is None:
+                self._meta_length = chunk[position] * 16
+                position += 1
+                if not self._meta_length:
+                    self._reset()
+            else:
+                size = min(self._meta_length - len(self._meta), len(chunk) - position)
+                self._meta += view[position : position + size]
+                position += size
+                if len(self._meta) == self._meta_length:
+                    title = self.parse_title(bytes(self._meta))
+                    if title is not None:
+                        titles.append(title)
+                    self._reset()
+
+        return bytes(audio), titles
+
+    @classmethod
+    def parse_title(cls, block: bytes) -> Optional[str]:
+        try:
+            text = block.rstrip(b"\0").decode("utf-8")
+        except UnicodeDecodeError:
+            text = block.rstrip(b"\0").decode("latin-1")
+        match = cls.TITLE_PATTERN.search(text)
+        return match.group(1).strip() if match else None
+
+    def _reset(self) -> None:
+        self._remaining = self.metaint
+        self._meta_length = None
+        self._meta.clear()
+
+
+class StreamPipe:
+    """Blocking file-like buffer between the async HTTP pull and ffmpeg's stdin."""
+
+    def __init__(self, limit: int = 1 << 20) -> None:
+        self.limit = limit
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def full(self) -> bool:
+        return self._size >= self.limit
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        with self._condition:
+            self._chunks.append(data)
+            self._size += len(data)
+            self._condition.notify()
+
+    def read(self, size: int = -1) -> bytes:
+        with self._condition:
+            self._condition.wait_for(lambda: self._chunks or self._closed)
+            if not self._chunks:
+                return b""
+            data = self._chunks.popleft()
+            if 0 < size < len(data):
+                self._chunks.appendleft(data[size:])
+                data = data[:size]
+            self._size -= len(data)
+            return data
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class StationIngest:
+    """A single ffmpeg pull of the station, encoded to Opus once for every guild.
+
+    In ``opus`` mode ffmpeg emits Ogg/Opus itself (copying the codec when the
+    upstream already is Opus) and the frames are forwarded untouched. In
+    ``pcm`` mode ffmpeg decodes to PCM and the frames are encoded in-process.
+
+    When a session is given the stream is requested with ``Icy-MetaData: 1``.
+    If the server answers with an ``icy-metaint`` the body is pulled here,
+    ``StreamTitle`` blocks are reported through ``on_title`` and the audio is
+    piped into ffmpeg. Otherwise ffmpeg pulls the URL itself.
+    """
+
+    PIPE_BEFORE_OPTIONS: str = "-re"
+    # Flush an Ogg page per packet instead of once a second, so frames reach
+    # the ring evenly and a stall shows up within a few frames.
+    OGG_OPTIONS: str = "-page_duration 20000"
+
+    def __init__(
+        self,
+        stream_url: str,
+        ring: OpusFrameRing,
+        ffmpeg_options: dict[str, str],
+        mode: str = "opus",
+        bitrate: int = 128,
+        session: Optional[aiohttp.ClientSession] = None,
+        on_title: Optional[Callable[[str], Any]] = None,
+        on_exit: Optional[Callable[[], Any]] = None,
+        codec: Optional[str] = None,
+    ) -> None:
+        self.stream_url = stream_url
+        self.ring = ring
+        self.ffmpeg_options = ffmpeg_options
+        self.mode = mode
+        self.bitrate = bitrate
+        self.session = session
+        self.on_title = on_title
+        self.on_exit = on_exit
+        self.codec = codec
+        self.icy = False
+        self.failed = False
+        self.started_at = time.monotonic()
+
+        self._frames = 0
+        self._cpu_time = 0.0
+        self._source: Optional[discord.FFmpegAudio] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._ready = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pipe: Optional[StreamPipe] = None
+        self._pump: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and not self._stopped.is_set()
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether the first frame has been read from ffmpeg."""
+        return self._ready.is_set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set() and not self.failed
+
+    async def wait_ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self.ready:
+            if self._stopped.is_set() or time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def start(self) -> None:
+        self.started_at = time.monotonic()
+        self._loop = asyncio.get_running_loop()
+        self._source = await self._create_source(await self._open_input())
+        self._thread = threading.Thread(
+            target=self._run, name=f"station-ingest:{id(self):#x}", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Station ingest started in {self.mode} mode"
+            f" ({'ICY metadata' if self.icy else 'no ICY metadata'})."
+        )
+
+    async def _open_input(self) -> str | StreamPipe:
+        if not self.session:
+            return self.stream_url
+
+        try:
+            response = await self.session.get(
+                self.stream_url,
+                headers={"Icy-MetaData": "1"},
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=10, sock_read=30
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"ICY request failed, letting ffmpeg pull the stream: {e}")
+            return self.stream_url
+
+        try:
+            response.raise_for_status()
+            metaint = int(response.headers.get("icy-metaint") or 0)
+        except Exception as e:
+            logger.warning(f"ICY request failed, letting ffmpeg pull the stream: {e}")
+            metaint = 0
+        if not metaint:
+            response.release()
+            return self.stream_url
+
+        self.icy = True
+        self._pipe = StreamPipe()
+        self._pump = asyncio.create_task(
+            self._pump_stream(response, IcyMetadataParser(metaint))
+        )
+        return self._pipe
+
+    async def _pump_stream(
+        self, response: aiohttp.ClientResponse, parser: IcyMetadataParser
+    ) -> None:
+        try:
+            async for chunk in response.content.iter_any():
+                audio, titles = parser.feed(chunk)
+                for title in titles:
+                    if title and self.on_title:
+                        self.on_title(title)
+                while self._pipe.full and not self._stopped.is_set():
+                    await asyncio.sleep(0.02)
+                self._pipe.write(audio)
+        except Exception as e:
+            if not self._stopped.is_set():
+                logger.error(f"Station stream pull failed: {e}")
+        finally:
+            response.release()
+            self._pipe.close()
+
+    async def _create_source(self, source: str | StreamPipe) -> discord.FFmpegAudio:
+        options = self.ffmpeg_options
+        if isinstance(source, StreamPipe):
+            options = {
+                **options,
+                "before_options": self.PIPE_BEFORE_OPTIONS,
+                "pipe": True,
+            }
+
+        if self.mode == "pcm":
+            return discord.FFmpegPCMAudio(source, **options)
+
+        options = {
+            **options,
+            "options": f"{options.get('options', '')} {self.OGG_OPTIONS}".strip(),
+        }
+        if self.codec is None:
+            self.codec, _ = await discord.FFmpegOpusAudio.probe(self.stream_url)
+        if self.codec == "opus":
+            return discord.FFmpegOpusAudio(source, codec="copy", **options)
+        return discord.FFmpegOpusAudio(source, bitrate=self.bitrate, **options)
+
+    def stats(self) -> dict[str, Any]:
+        """CPU spent by the bot process on each second of ingested audio."""
+        seconds = self._frames * discord.opus.Encoder.FRAME_LENGTH / 1000
+        return {
+            "mode": self.mode,
+            "codec": self.codec,
+            "icy": self.icy,
+            "frames": self._frames,
+            "cpu_ms_per_audio_s": (
+                round(self._cpu_time * 1000 / seconds, 3) if seconds else 0.0
+            ),
+        }
+
+    def stop(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._pipe:
+            self._pipe.close()
+        if self._pump and self._loop:
+            self._loop.call_soon_threadsafe(self._pump.cancel)
+        if self._source:
+            self._source.cleanup()
+        logger.info("Station ingest stopped.")
+
+    def _run(self) -> None:
+        encoder = discord.opus.Encoder() if self.mode == "pcm" else None
+        started = time.thread_time()
+        try:
+            while not self._stopped.is_set():
+                data = self._source.read()
+                if not data:
+                    break
+                if encoder:
+                    data = encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+                self.ring.publish(data, writer=self)
+                self._ready.set()
+                self._frames += 1
+                self._cpu_time = time.thread_time() - started
+        except Exception as e:
+            if not self._stopped.is_set():
+                logger.error(f"Station ingest error: {e}")
+        finally:
+            unexpected = not self._stopped.is_set()
+            if unexpected:
+                self.failed = True
+                logger.error("Station ingest ended unexpectedly.")
+            logger.info(f"Station ingest stats: {self.stats()}")
+            self.stop()
+            if unexpected and self.on_exit:
+                self.on_exit()
+
+
+class LatencyStats:
+    """Rolling window of latency samples for the periodic metrics log."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(samples) * 1000 / len(samples), 2),
+            "p95_ms": round(samples[int(len(samples) * 0.95) - 1 or 0] * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+class FrameMultiplexer:
+    """One audio thread that sends the shared frame to every subscribed voice client.
+
+    A single 20 ms clock drives every guild, replacing the per-guild
+    ``AudioPlayer`` threads. Each tick reads the next frame from the ring once
+    and hands the same bytes to every connected client. Without subscribers
+    the thread sleeps until the next subscription.
+    """
+
+    DELAY: float = discord.opus.Encoder.FRAME_LENGTH / 1000
+    MAX_LAG: int = 5
+    SILENCE_FRAMES: int = 5
+
+    def __init__(self, ring: OpusFrameRing, loop: asyncio.AbstractEventLoop) -> None:
+        self.ring = ring
+        self.loop = loop
+
+        self._clients: dict[int, VoiceClient] = {}
+        self._connected: dict[int, bool] = {}
+        self._lock = threading.Lock()
+        self._end = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cursor = 0
+        self._last_sent: dict[int, float] = {}
+        self._dropped: set[int] = set()
+
+        self.frames_sent = 0
+        self.jitter = LatencyStats()
+        self.voice_gap = LatencyStats()
+
+    def start(self) -> None:
+        self._cursor = self.ring.sequence
+        self._thread = threading.Thread(
+            target=self._run, name="frame-multiplexer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._end.set()
+        self._wake.set()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def is_subscribed(self, voice_client: VoiceClient) -> bool:
+        return self._clients.get(voice_client.guild.id) is voice_client
+
+    async def subscribe(self, voice_client: VoiceClient) -> None:
+        with self._lock:
+            self._clients[voice_client.guild.id] = voice_client
+            self._connected[voice_client.guild.id] = voice_client.is_connected()
+        self._wake.set()
+        await self._speak(voice_client, discord.SpeakingState.voice)
+
+    async def unsubscribe(self, voice_client: VoiceClient) -> None:
+        with self._lock:
+            if self._clients.get(voice_client.guild.id) is not voice_client:
+                return
+            del self._clients[voice_client.guild.id]
+            self._connected.pop(voice_client.guild.id, None)
+            self._last_sent.pop(voice_client.guild.id, None)
+            self._dropped.discard(voice_client.guild.id)
+
+        if voice_client.is_connected():
+            self._send_silence(voice_client)
+            await self._speak(voice_client, discord.SpeakingState.none)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "ring_bytes": self.ring.nbytes,
+            "frames_sent": self.frames_sent,
+            "threads": threading.active_count(),
+            "jitter": self.jitter.snapshot(),
+        }
+
+    async def _speak(
+        self, voice_client: VoiceClient, state: discord.SpeakingState
+    ) -> None:
+        try:
+            await voice_client.ws.speak(state)
+        except Exception as e:
+            logger.debug(f"Speaking update failed: {e}")
+
+    def _send_silence(self, voice_client: VoiceClient) -> None:
+        try:
+            for _ in range(self.SILENCE_FRAMES):
+                voice_client.send_audio_packet(discord.opus.OPUS_SILENCE, encode=False)
+        except Exception:
+            pass
+
+    def _next_frame(self) -> Optional[bytes]:
+        if self.ring.sequence - self._cursor > self.MAX_LAG:
+            self._cursor = self.ring.sequence - 1
+        self._cursor, frame = self.ring.read(self._cursor, self.DELAY / 2)
+        return frame
+
+    def _run(self) -> None:
+        loops = 0
+        start = time.perf_counter()
+
+        while not self._end.is_set():
+            if not self._clients:
+                self._wake.wait()
+                self._wake.clear()
+                self._cursor = self.ring.sequence
+                loops, start = 0, time.perf_counter()
+                continue
+
+            frame = self._next_frame()
+            if frame is not None:
+                with self._lock:
+                    clients = list(self._clients.items())
+                for guild_id, voice_client in clients:
+                    self._send(guild_id, voice_client, frame)
+
+            loops += 1
+            next_time = start + self.DELAY * loops
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.jitter.observe(abs(time.perf_counter() - next_time))
+
+    def _send(self, guild_id: int, voice_client: VoiceClient, frame: bytes) -> None:
+        connected = voice_client.is_connected()
+        if connected and not self._connected.get(guild_id, True):
+            asyncio.run_coroutine_threadsafe(
+                self._speak(voice_client, discord.SpeakingState.voice), self.loop
+            )
+        self._connected[guild_id] = connected
+        if not connected:
+            self._dropped.add(guild_id)
+            return
+
+        try:
+            voice_client.send_audio_packet(frame, encode=False)
+            self.frames_sent += 1
+        except Exception as e:
+            logger.debug(f"Dropped frame for guild {guild_id}: {e}")
+            return
+
+        # The gap spans from the last frame before the drop to the first one
+        # after it, whether the same client came back or a new one replaced it.
+        now = time.perf_counter()
+        if guild_id in self._dropped:
+            self._dropped.discard(guild_id)
+            if guild_id in self._last_sent:
+                self.voice_gap.observe(now - self._last_sent[guild_id])
+        self._last_sent[guild_id] = now
+
+
+class StreamResolver:
+    """TTL cache in front of the station license endpoint.
+
+    Concurrent callers share one in-flight request, and the cached value is
+    refreshed in the background before it expires so callers never wait on
+    the endpoint while a fresh value is held.
+    """
+
+    REFRESH_AHEAD: float = 0.8
+
+    def __init__(self, radio_bot: RadioBot, ttl: float = 600) -> None:
+        self.radio_bot = radio_bot
+        self.ttl = ttl
+
+        self._data: Optional[dict] = None
+        self._fetched_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self._refresh_handle: Optional[asyncio.TimerHandle] = None
+
+        self.requests = 0
+        self.hits = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        return self._data is not None and self.age < self.ttl
+
+    async def resolve(self, force: bool = False) -> dict:
+        if self.fresh and not force:
+            self.hits += 1
+            return self._data
+
+        try:
+            return await asyncio.shield(self._fetch_shared())
+        except Exception as e:
+            if self._data is None:
+                raise
+            logger.warning(f"License refresh failed, serving stale stream data: {e}")
+            return self._data
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "age_s": round(self.age, 1) if self._data else None,
+        }
+
+    def close(self) -> None:
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+
+    def _fetch_shared(self) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+            self._inflight.add_done_callback(self._log_failure)
+        return self._inflight
+
+    async def _fetch(self) -> dict:
+        self.requests += 1
+        data = await self.radio_bot.license.call(self._request)
+
+        decoded_data = base64.b64decode(data).decode("utf-8")
+        self._data = json.loads(decoded_data)
+        self._fetched_at = time.monotonic()
+        self._schedule_refresh()
+        return self._data
+
+    async def _request(self, session: aiohttp.ClientSession) -> str:
+        timestamp = int(time.time() * 1000)
+        params: dict[str, Any] = {"_": timestamp}
+        async with session.get(self.radio_bot.base_url, params=params) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+        self._refresh_handle = asyncio.get_running_loop().call_later(
+            self.ttl * self.REFRESH_AHEAD, self._refresh_ahead
+        )
+
+    def _refresh_ahead(self) -> None:
+        # While nobody listens the next resolve fetches on demand instead.
+        if self.radio_bot.listener_count:
+            self._fetch_shared()
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            logger.error(f"Error resolving stream URL: {task.exception()}")
+
+
+@dataclass
+class StreamMirror:
+    """One stream entry of the license response, with its probe results."""
+
+    url: str
+    text_url: Optional[str] = None
+    group: int = 0
+    index: int = 0
+
+    connect_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    failures: int = 0
+    down_until: float = 0.0
+
+    @classmethod
+    def parse(cls, stream_data: dict) -> list[StreamMirror]:
+        mirrors = []
+        for group, entries in enumerate(stream_data.get("streams") or []):
+            for index, entry in enumerate(entries or []):
+                if isinstance(entry, dict) and entry.get("url"):
+                    mirrors.append(
+                        cls(entry["url"], entry.get("textUrl"), group, index)
+                    )
+        return mirrors
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+
+class MirrorSelector:
+    """Picks the fastest healthy mirror and fails over to the next one.
+
+    Candidates are probed concurrently for connect latency and time to first
+    audio byte, on fresh connections so the connect time is real. Selection
+    goes ahead as soon as the first probe succeeds; slower probes finish in
+    the background. Probe results are reused for ``probe_ttl`` seconds. A
+    mirror that fails a probe or is reported as failed is skipped for
+    ``cooldown`` seconds.
+    """
+
+    def __init__(
+        self, probe_timeout: float = 5, probe_ttl: float = 60, cooldown: float = 120
+    ) -> None:
+        self.probe_timeout = probe_timeout
+        self.probe_ttl = probe_ttl
+        self.cooldown = cooldown
+
+        self.mirrors: list[StreamMirror] = []
+        self.current: Optional[StreamMirror] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._probed_at = 0.0
+        self._probing: set[asyncio.Task] = set()
+
+        self.probes = 0
+        self.failovers = 0
+
+    def open(self) -> None:
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_start.append(self._on_connect_start)
+        trace.on_connection_create_end.append(self._on_connect_end)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(force_close=True),
+            timeout=aiohttp.ClientTimeout(total=self.probe_timeout),
+            trace_configs=[trace],
+        )
+
+    async def close(self) -> None:
+        for task in self._probing:
+            task.cancel()
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def update(self, mirrors: list[StreamMirror]) -> None:
+        """Replace the candidate list, keeping the health of known URLs."""
+        known = {mirror.url: mirror for mirror in self.mirrors}
+        self.mirrors = [known.get(mirror.url, mirror) for mirror in mirrors]
+        if any(mirror.url not in known for mirror in mirrors):
+            self._probed_at = 0.0
+
+    async def select(self) -> Optional[StreamMirror]:
+        if not self.mirrors:
+            return None
+        if (
+            len(self.mirrors) > 1
+            and time.monotonic() - self._probed_at > self.probe_ttl
+        ):
+            self._probed_at = time.monotonic()
+            await self._probe_all()
+
+        healthy = [mirror for mirror in self.mirrors if mirror.healthy]
+        if healthy:
+            # Unprobed mirrors rank after probed ones, in license order.
+            best = min(
+                healthy,
+                key=lambda m: (m.ttfb_ms is None, m.ttfb_ms or 0, m.group, m.index),
+            )
+        else:
+            best = min(self.mirrors, key=lambda m: m.down_until)
+
+        if self.current and best.url != self.current.url:
+            logger.info(f"Switching stream mirror to {best.url}")
+        self.current = best
+        return best
+
+    def fail(self, mirror: Optional[StreamMirror] = None) -> None:
+        """Take ``mirror`` (the current one by default) out of rotation for a while."""
+        mirror = mirror or self.current
+        if not mirror:
+            return
+        mirror.failures += 1
+        mirror.down_until = time.monotonic() + self.cooldown
+        if mirror is self.current:
+            self.failovers += 1
+        logger.warning(f"Stream mirror {mirror.url} failed, trying the next one.")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "current": self.current.url if self.current else None,
+            "probes": self.probes,
+            "failovers": self.failovers,
+            "mirrors": [
+                {
+                    "url": mirror.url,
+                    "connect_ms": mirror.connect_ms,
+                    "ttfb_ms": mirror.ttfb_ms,
+                    "healthy": mirror.healthy,
+                }
+                for mirror in self.mirrors
+            ],
+        }
+
+    async def _probe_all(self) -> None:
+        pending = set()
+        for mirror in self.mirrors:
+            if mirror.healthy:
+                # Results from an earlier round must not outrank this one.
+                mirror.ttfb_ms = mirror.connect_ms = None
+                task = asyncio.create_task(self._probe(mirror))
+                task.add_done_callback(self._probing.discard)
+                self._probing.add(task)
+                pending.add(task)
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            if any(task.result() for task in done):
+                return
+
+    async def _probe(self, mirror: StreamMirror) -> bool:
+        self.probes += 1
+        timings: dict[str, float] = {}
+        started = time.monotonic()
+        try:
+            async with self.session.get(
+                mirror.url, headers={"Icy-MetaData": "1"}, trace_request_ctx=timings
+            ) as response:
+                response.raise_for_status()
+                await response.content.readany()
+        except Exception as e:
+            logger.warning(f"Probe of stream mirror {mirror.url} failed: {e}")
+            mirror.ttfb_ms = mirror.connect_ms = None
+            self.fail(mirror)
+            return False
+
+        mirror.ttfb_ms = round((time.monotonic() - started) * 1000, 1)
+        connect = timings.get("connect")
+        mirror.connect_ms = round(connect * 1000, 1) if connect is not None else None
+        return True
+
+    @staticmethod
+    async def _on_connect_start(session, context, params) -> None:
+        context.trace_request_ctx["started"] = time.monotonic()
+
+    @staticmethod
+    async def _on_connect_end(session, context, params) -> None:
+        timings = context.trace_request_ctx
+        timings["connect"] = time.monotonic() - timings["started"]
+
+
+class MessageEditScheduler:
+    """Coalescing, rate-limit-aware queue for player message edits.
+
+    At most one edit is pending per message and scheduling a newer state
+    replaces the queued one, so the latest state always wins. A message is
+    never edited by two workers at once, which keeps older edits from landing
+    after newer ones. A fixed pool of workers caps concurrency, rate limits are
+    retried after ``Retry-After`` and messages that are gone are dropped for good.
+
+    The payload last sent to each message is kept as a fingerprint, so edits
+    that would leave a message as it already is are skipped. Payload values
+    may be callables; they are called for every attempt, so a retried edit
+    never resends a ``discord.File`` that was already consumed.
+    """
+
+    MAX_FINGERPRINTS: int = 4096
+    MAX_GONE: int = 4096
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        on_gone: Optional[Callable[[Message], Any]] = None,
+        on_sent: Optional[Callable[[Message, dict[str, Any]], Any]] = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.on_gone = on_gone
+        self.on_sent = on_sent
+
+        self._pending: dict[int, tuple[Message, dict[str, Any], float]] = {}
+        self._inflight: dict[int, str] = {}
+        self._fingerprints: OrderedDict[int, str] = OrderedDict()
+        # Recently dropped message ids, oldest first. Anything older has long
+        # left every view and session, so nothing schedules it anymore.
+        self._gone: OrderedDict[int, None] = OrderedDict()
+        # Created in start() so it binds to the loop client.run() starts.
+        self._queue: Optional[asyncio.Queue[int]] = None
+        self._workers: list[asyncio.Task] = []
+
+        self.sent = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.dropped = 0
+        self.latency = LatencyStats()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+
+    @staticmethod
+    def fingerprint(kwargs: dict[str, Any]) -> str:
+        """Digest of an edit payload: embed dicts plus attachment filenames."""
+        payload = {}
+        for name, value in kwargs.items():
+            if callable(value):
+                value = value()
+            if isinstance(value, discord.Embed):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [getattr(item, "filename", repr(item)) for item in value]
+            elif value is MISSING:
+                value = None
+            payload[name] = value
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def remember(self, message: Message, **kwargs: Any) -> None:
+        """Record what ``message`` shows after it was sent outside the scheduler."""
+        self._fingerprints[message.id] = self.fingerprint(kwargs)
+        self._fingerprints.move_to_end(message.id)
+        while len(self._fingerprints) > self.MAX_FINGERPRINTS:
+            self._fingerprints.popitem(last=False)
+
+    def schedule(self, message: Message, **kwargs: Any) -> None:
+        if message.id in self._gone:
+            return
+
+        # Compare against what the message will show once any in-flight edit lands.
+        shown = self._inflight.get(message.id) or self._fingerprints.get(message.id)
+        if shown == self.fingerprint(kwargs):
+            self.skipped += 1
+            self._pending.pop(message.id, None)
+            return
+
+        queued = message.id in self._pending
+        if queued:
+            self.coalesced += 1
+            enqueued_at = self._pending[message.id][2]
+        else:
+            enqueued_at = time.monotonic()
+        self._pending[message.id] = (message, kwargs, enqueued_at)
+
+        if not queued and message.id not in self._inflight:
+            self._queue.put_nowait(message.id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "inflight": len(self._inflight),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "latency": self.latency.snapshot(),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            message_id = await self._queue.get()
+            entry = self._pending.pop(message_id, None)
+            if entry is None:
+                continue
+
+            self._inflight[message_id] = self.fingerprint(entry[1])
+            try:
+                await self._edit(*entry)
+            finally:
+                self._inflight.pop(message_id, None)
+                if message_id in self._pending:
+                    self._queue.put_nowait(message_id)
+
+    async def _edit(
+        self, message: Message, kwargs: dict[str, Any], enqueued_at: float
+    ) -> None:
+        payload = {
+            name: value() if callable(value) else value
+            for name, value in kwargs.items()
+        }
+        try:
+            edited = await message.edit(**payload)
+            self.remember(message, **payload)
+            self.sent += 1
+            self.latency.observe(time.monotonic() - enqueued_at)
+            if self.on_sent:
+                self.on_sent(edited, payload)
+        except discord.NotFound:
+            self._drop(message)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                await self._retry_later(message, kwargs, enqueued_at, retry_after)
+            elif e.status == 401 or e.code == 50027:
+                # Interaction tokens expire; the message can't be edited anymore.
+                self._drop(message)
+            else:
+                self.failed += 1
+                logger.error(f"Failed to edit player message {message.id}: {e}")
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Failed to edit player message {message.id}: {e}")
+
+    async def _retry_later(
+        self,
+        message: Message,
+        kwargs: dict[str, Any],
+        enqueued_at: float,
+        retry_after: float,
+    ) -> None:
+        self.rate_limited += 1
+        logger.warning(
+            f"Rate limited editing {message.id}, retrying in {retry_after}s."
+        )
+        await asyncio.sleep(retry_after)
+        self._pending.setdefault(message.id, (message, kwargs, enqueued_at))
+
+    def _drop(self, message: Message) -> None:
+        self.dropped += 1
+        self._gone[message.id] = None
+        self._gone.move_to_end(message.id)
+        while len(self._gone) > self.MAX_GONE:
+            self._gone.popitem(last=False)
+        self._pending.pop(message.id, None)
+        self._fingerprints.pop(message.id, None)
+        if self.on_gone:
+            self.on_gone(message)
+
+
+class PresenceManager:
+    """Throttled, coalescing presence updates.
+
+    Presence changes go over the gateway websocket, which has a strict rate
+    limit of its own. At most one update is sent per ``interval`` and it
+    always carries the latest track; updates that wouldn't change what is
+    shown are skipped. A sharded client gets each shard updated once. A
+    failed update is retried in the next window unless a newer track arrived.
+    """
+
+    def __init__(self, bot: discord.Client, interval: float = 15) -> None:
+        self.bot = bot
+        self.interval = interval
+
+        self._desired: Optional[str] = None
+        self._shown: dict[Optional[int], str] = {}
+        self._last_sent = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.failed = 0
+
+    @staticmethod
+    def activity(track_name: str) -> discord.Activity:
+        return discord.Activity(
+            type=discord.ActivityType.listening,
+            name=f"{track_name}",
+            state="📻 Radio ATAC",
+            details="🎶 Musica della città",
+        )
+
+    def update(self, track_name: str) -> None:
+        if self._desired is not None:
+            self.coalesced += 1
+        self._desired = track_name
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+    @property
+    def _shards(self) -> list[Optional[int]]:
+        if isinstance(self.bot, discord.AutoShardedClient):
+            return list(self.bot.shards)
+        return [None]
+
+    async def _flush(self) -> None:
+        await self.bot.wait_until_ready()
+        while self._desired is not None:
+            delay = self._last_sent + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            track_name, self._desired = self._desired, None
+            stale = [s for s in self._shards if self._shown.get(s) != track_name]
+            if not stale:
+                self.skipped += 1
+                continue
+
+            activity = self.activity(track_name)
+            updated = 0
+            for shard_id in stale:
+                try:
+                    if shard_id is None:
+                        await self.bot.change_presence(activity=activity)
+                    else:
+                        await self.bot.change_presence(
+                            activity=activity, shard_id=shard_id
+                        )
+                    self._shown[shard_id] = track_name
+                    updated += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Failed to update presence: {e}")
+            if updated:
+                self.sent += 1
+            if updated < len(stale) and self._desired is None:
+                self._desired = track_name
+            self._last_sent = time.monotonic()
+
+
+class ViewRegistry:
+    """Player views indexed by guild and message id, held by weak reference.
+
+    Ephemeral interaction messages can only be edited while the interaction
+    token is valid, so each entry expires shortly before the token does and is
+    evicted from the edit fan-out. Views that are no longer referenced
+    elsewhere (for example after their own timeout) disappear on their own.
+    """
+
+    TOKEN_LIFETIME: float = 15 * 60
+    EXPIRY_MARGIN: float = 60
+
+    def __init__(self) -> None:
+        self._entries: dict[int, dict[int, tuple[weakref.ref, float]]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def register(
+        self,
+        guild_id: int,
+        view: RadioControlView,
+        interaction: Optional[Interaction] = None,
+    ) -> None:
+        expires_at = float("inf")
+        if interaction is not None:
+            age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+            expires_at = (
+                time.monotonic() + self.TOKEN_LIFETIME - self.EXPIRY_MARGIN - age
+            )
+        self._entries.setdefault(guild_id, {})[view.message.id] = (
+            weakref.ref(view),
+            expires_at,
+        )
+
+    def discard(self, message_id: int) -> None:
+        for guild_id, entries in list(self._entries.items()):
+            if entries.pop(message_id, None) and not entries:
+                del self._entries[guild_id]
+
+    def views(self, guild_id: Optional[int] = None) -> list[RadioControlView]:
+        self.purge()
+        guilds = [guild_id] if guild_id is not None else list(self._entries)
+        views = []
+        for guild in guilds:
+            for ref, _ in self._entries.get(guild, {}).values():
+                view = ref()
+                if view is not None:
+                    views.append(view)
+        return views
+
+    def purge(self) -> None:
+        now = time.monotonic()
+        for guild_id, entries in list(self._entries.items()):
+            for message_id, (ref, expires_at) in list(entries.items()):
+                if expires_at <= now or ref() is None:
+                    del entries[message_id]
+                    self.evicted += 1
+            if not entries:
+                del self._entries[guild_id]
+
+    def stats(self) -> dict[str, Any]:
+        self.purge()
+        return {
+            "guilds": len(self._entries),
+            "views": len(self),
+            "evicted": self.evicted,
+        }
+
+
+class PlaceholderAsset:
+    """The placeholder thumbnail, read once and uploaded as rarely as possible.
+
+    The bytes live in memory so every upload gets its own ``discord.File``.
+    Once an upload went through, the attachment's CDN URL is reused until its
+    signed expiry, so later embeds reference it without a multipart upload.
+    """
+
+    EXPIRY_MARGIN: float = 3600
+    DEFAULT_LIFETIME: float = 24 * 3600
+
+    def __init__(self, path: str) -> None:
+        self.filename = os.path.basename(path)
+        with open(path, "rb") as f:
+            self.data = f.read()
+
+        self._url: Optional[str] = None
+        self._expires_at = 0.0
+        self.uploads = 0
+
+    @property
+    def url(self) -> Optional[str]:
+        if self._url and time.time() < self._expires_at - self.EXPIRY_MARGIN:
+            return self._url
+        return None
+
+    @property
+    def thumbnail(self) -> str:
+        return self.url or f"attachment://{self.filename}"
+
+    def file(self) -> discord.File:
+        return discord.File(io.BytesIO(self.data), filename=self.filename)
+
+    def attachments(self) -> list[discord.File]:
+        return [self.file()]
+
+    def remember(self, message: Optional[Message], uploaded: bool = False) -> None:
+        """Cache the CDN URL of the placeholder if ``message`` carries it.
+
+        ``uploaded`` marks a message that was just sent with the file attached.
+        """
+        if uploaded:
+            self.uploads += 1
+        for attachment in getattr(message, "attachments", None) or []:
+            if attachment.filename != self.filename:
+                continue
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(attachment.url).query)
+            try:
+                self._expires_at = int(query["ex"][0], 16)
+            except (KeyError, ValueError):
+                self._expires_at = time.time() + self.DEFAULT_LIFETIME
+            self._url = attachment.url
+            return
+
+
+class PlayerMessageStore:
+    """JSON file remembering each guild's public now-playing message."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> dict[int, tuple[int, int]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load player messages: {e}")
+            return {}
+        return {
+            int(guild_id): (int(ids["channel_id"]), int(ids["message_id"]))
+            for guild_id, ids in data.items()
+        }
+
+    def save(self, messages: dict[int, tuple[int, int]]) -> None:
+        data = {
+            str(guild_id): {"channel_id": channel_id, "message_id": message_id}
+            for guild_id, (channel_id, message_id) in messages.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save player messages: {e}")
+
+
+class GuildSession:
+    """Playback state of a single guild: its voice client, status and views.
+
+    ``phase`` moves through idle -> connecting -> playing <-> paused ->
+    disconnecting -> idle. Transitions run one at a time per guild, in the
+    order they were requested. A request matching the most recent one joins
+    it instead of queueing again, so the last request always wins. The lock
+    only covers voice and multiplexer work; player messages are repainted in
+    the background afterwards.
+    """
+
+    IDLE = "idle"
+    CONNECTING = "connecting"
+    PLAYING = "playing"
+    PAUSED = "paused"
+    DISCONNECTING = "disconnecting"
+
+    def __init__(self, radio_bot: RadioBot, guild_id: int) -> None:
+        self.radio_bot = radio_bot
+        self.guild_id = guild_id
+        self.voice_client: Optional[VoiceClient] = None
+        self.player_message: Optional[discord.Message | discord.PartialMessage] = None
+
+        self.status = "Now Playing"
+        self.description: Optional[str] = None
+        self.color = discord.Color.green()
+
+        self.listeners = 0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._soft_stop_handle: Optional[asyncio.TimerHandle] = None
+
+        self.phase = self.IDLE
+        self._transition_lock = asyncio.Lock()
+        self._latest: Optional[tuple[str, asyncio.Task]] = None
+        self.coalesced = 0
+
+    async def transition(self, name: str, action: Callable[[], Any]) -> Any:
+        """Run ``action`` after the transitions already requested for this guild.
+
+        A request with the same ``name`` as the latest unfinished one shares
+        its run; once anything else was requested after it, it queues again.
+        """
+        if self._latest and self._latest[0] == name and not self._latest[1].done():
+            self.coalesced += 1
+            task = self._latest[1]
+        else:
+            task = asyncio.create_task(self._run_transition(action))
+            self._latest = (name, task)
+        return await asyncio.shield(task)
+
+    async def _run_transition(self, action: Callable[[], Any]) -> Any:
+        async with self._transition_lock:
+            return await action()
+
+    @property
+    def views(self) -> list[RadioControlView]:
+        return self.radio_bot.views.views(self.guild_id)
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        vc = self.voice_client
+        if not vc or not vc.channel:
+            return None
+        # A dropped connection that is still playing is about to be brought
+        # back, so the people waiting in its channel keep counting.
+        if vc.is_connected() or self.phase == self.PLAYING:
+            return vc.channel.id
+        return None
+
+    def count_listeners(self) -> int:
+        """Count the people, not bots, in the voice channel the bot is in."""
+        vc = self.voice_client
+        if self.channel_id is None:
+            self.listeners = 0
+        else:
+            self.listeners = sum(1 for m in vc.channel.members if not m.bot)
+
+        if self.listeners or self.channel_id is None:
+            self.cancel_idle_disconnect()
+        elif self._idle_handle is None:
+            self._idle_handle = asyncio.get_running_loop().call_later(
+                self.radio_bot.bot.config.idle_timeout, self._idle_disconnect
+            )
+        return self.listeners
+
+    @property
+    def soft_stopped(self) -> bool:
+        return self._soft_stop_handle is not None
+
+    def soft_stop(self, timeout: float) -> None:
+        """Keep the voice connection for ``timeout`` seconds, then disconnect."""
+        self.cancel_soft_stop()
+        self._soft_stop_handle = asyncio.get_running_loop().call_later(
+            timeout, self._soft_stop_expired
+        )
+
+    def cancel_soft_stop(self) -> None:
+        if self._soft_stop_handle:
+            self._soft_stop_handle.cancel()
+            self._soft_stop_handle = None
+
+    def _soft_stop_expired(self) -> None:
+        self._soft_stop_handle = None
+        if self.voice_client:
+            self.radio_bot.spawn(self.radio_bot.stop_stream(self.voice_client))
+
+    def cancel_idle_disconnect(self) -> None:
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _idle_disconnect(self) -> None:
+        self._idle_handle = None
+        if self.voice_client and not self.count_listeners():
+            logger.info(f"Leaving the empty voice channel in guild {self.guild_id}.")
+            self.radio_bot.spawn(self.radio_bot.stop_stream(self.voice_client))
+
+    def set_state(
+        self,
+        status: str,
+        color: discord.Color,
+        description: Optional[str] = None,
+    ) -> None:
+        self.status = status
+        self.color = color
+        self.description = description
+
+    @property
+    def state(self) -> tuple[str, str, discord.Color]:
+        return (
+            self.status,
+            self.description or self.radio_bot.current_track,
+            self.color,
+        )
+
+    async def update_player_messages(self) -> None:
+        messages = [view.message for view in self.views if view.message]
+        if self.player_message:
+            messages.append(self.player_message)
+        if not messages:
+            return
+
+        state = self.state
+        embed, placeholder = await self.radio_bot.render_player_embed(*state)
+        if self.state != state:
+            # Repaints run in the background; the newer one carries the state.
+            return
+        for message in messages:
+            self.radio_bot.edit_scheduler.schedule(
+                message,
+                embed=embed,
+                attachments=(
+                    self.radio_bot.thumbnail.attachments if placeholder else MISSING
+                ),
+            )
+
 
 class RadioBot:
     def __init__(self, bot: Client) -> None:
@@ -85,59 +1828,183 @@ class RadioBot:
         self.track_name_url: Optional[str] = None
         self.current_track: str = "Unknown Track"
 
+        self.ffmpeg_options: dict[str, str] = {
+            "before_options": "-re -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
+            "options": "-vn",
+        }
+        self.ring = OpusFrameRing(seconds=bot.config.buffer_seconds)
+        self.multiplexer: Optional[FrameMultiplexer] = None
+        self.ingest: Optional[StationIngest] = None
+        # Created in setup() so it binds to the loop client.run() starts.
+        self._ingest_lock: Optional[asyncio.Lock] = None
+        self.watchdog = IngestWatchdog(self)
+        self.voice_supervisor = VoiceSupervisor(self)
+        self.recoveries = 0
+        self.recovery_time = LatencyStats()
+        self.recovery_gap = LatencyStats()
+        self._background_tasks: set[asyncio.Task] = set()
+
+        self.thumbnail = PlaceholderAsset("assets/thumbnail.png")
+        self.placeholder = True
+        self._rendered: dict[tuple, tuple[discord.Embed, bool]] = {}
+        self.response_latency = LatencyStats()
+
         self.session: Optional[aiohttp.ClientSession] = None
+        self.license = Upstream(
+            "license", connect_timeout=5, read_timeout=10, retries=2, limit_per_host=2
+        )
+        self.titles = Upstream(
+            "titles", read_timeout=5, limit_per_host=2, keepalive_timeout=60
+        )
+        self.itunes = Upstream("itunes", read_timeout=5, limit_per_host=4)
+        self.stream_resolver = StreamResolver(self, ttl=bot.config.stream_url_ttl)
+        self.mirrors = MirrorSelector()
+        self.metadata_cache = MetadataCache()
+        self.edit_scheduler = MessageEditScheduler(
+            concurrency=bot.config.edit_concurrency,
+            on_gone=self._forget_message,
+            on_sent=self._on_player_edited,
+        )
+        self.presence = PresenceManager(bot, interval=bot.config.presence_interval)
         self.track_info_updater: Optional[TrackInfoUpdater] = None
-        self.active_views: set[RadioControlView] = set()
-
-        self.file = discord.File("assets/thumbnail.png", filename="thumbnail.png")
-        self.placeholder = True
+        self.metrics_reporter: Optional[MetricsReporter] = None
+        self.views = ViewRegistry()
+        self.sessions: dict[int, GuildSession] = {}
+        self.player_store = PlayerMessageStore(bot.config.player_state_file)
+        self.persistent_view: Optional[RadioControlView] = None
 
     async def setup(self) -> None:
         self.session = aiohttp.ClientSession()
+        self._ingest_lock = asyncio.Lock()
+        for upstream in self.upstreams:
+            upstream.open()
+        self.mirrors.open()
         self.track_info_updater = TrackInfoUpdater(self)
+        self.metrics_reporter = MetricsReporter(self)
+        self.multiplexer = FrameMultiplexer(self.ring, asyncio.get_running_loop())
+        self.multiplexer.start()
+        self.edit_scheduler.start()
+        # Routes the buttons of every player message by custom_id, including
+        # those whose own view has timed out.
+        self.persistent_view = RadioControlView(self, persistent=True)
+        self.bot.add_view(self.persistent_view)
+        if self.bot.config.persistent_player:
+            self.restore_player_messages()
 
         try:
+            # The station is pulled lazily, once the first listener joins.
             await self.get_dynamic_url()
             initial_track = await self.track_info_updater.fetch_track_name()
             self.current_track = initial_track
-            await self.update_presence()
+            self.update_presence()
         except Exception as e:
             logger.error(f"Failed to fetch initial track info: {e}")
 
         self.track_info_updater.start_updater()
+        self.metrics_reporter.start_reporter()
+        self.watchdog.start_watchdog()
+        self.voice_supervisor.start_supervisor()
         logger.info("RadioBot setup completed")
 
     async def cleanup(self) -> None:
+        self.stream_resolver.close()
+        self.watchdog.check.cancel()
+        self.voice_supervisor.stop()
+        self.edit_scheduler.stop()
+        self.presence.stop()
+        if self.multiplexer:
+            self.multiplexer.stop()
+        if self.ingest:
+            self.ingest.stop()
+        self.ring.close()
         if self.session and not self.session.closed:
             await self.session.close()
+        for upstream in self.upstreams:
+            await upstream.close()
+        await self.mirrors.close()
         logger.info("RadioBot cleanup completed")
 
     async def get_dynamic_url(self) -> None:
-        timestamp = int(time.time() * 1000)
-        params: dict[str, Any] = {"_": timestamp}
-        async with self.session.get(self.base_url, params=params) as response:
-            response.raise_for_status()
-            data = await response.text()
-            decoded_data = base64.b64decode(data).decode("utf-8")
-            stream_data = json.loads(decoded_data)
-            self.stream_url = stream_data["streams"][0][0]["url"]
-            self.track_name_url = stream_data["streams"][0][0]["textUrl"]
-            logger.info("Stream URL and track name URL updated successfully.")
+        stream_data = await self.stream_resolver.resolve()
+        self.mirrors.update(StreamMirror.parse(stream_data))
+        mirror = await self.mirrors.select()
+        if not mirror:
+            raise ValueError("The license response lists no streams.")
+
+        self.stream_url = mirror.url
+        self.track_name_url = mirror.text_url or next(
+            (m.text_url for m in self.mirrors.mirrors if m.text_url), None
+        )
+        logger.info("Stream URL and track name URL updated successfully.")
+
+    def prefetch_artwork(self, track_name: str) -> None:
+        """Start the artwork lookup for a newly detected title right away."""
+        self.spawn(
+            SongMetadata(track_name, self.itunes, self.metadata_cache).get_song()
+        )
 
     async def create_player_embed(
         self,
         status: str = "Now Playing",
         description: Optional[str] = None,
         color: discord.Color = discord.Color.green(),
+        wait: bool = True,
     ) -> discord.Embed:
-        metadata = SongMetadata(self.current_track or description, self.session)
+        embed, self.placeholder = await self.render_player_embed(
+            status, description, color, wait
+        )
+        return embed
+
+    async def render_player_embed(
+        self,
+        status: str = "Now Playing",
+        description: Optional[str] = None,
+        color: discord.Color = discord.Color.green(),
+        wait: bool = True,
+    ) -> tuple[discord.Embed, bool]:
+        """Return the player embed and whether it needs the placeholder uploaded.
+
+        Renders are memoised per (track, status, text, color) until the track
+        changes, so every open player reuses the same embed. With ``wait``
+        unset, artwork that isn't cached yet is not looked up and the
+        placeholder is used instead. Neither that render nor one built after a
+        failed lookup is memoised, so the artwork is picked up once it arrives.
+        """
+        key = (
+            self.current_track,
+            status,
+            description,
+            color.value,
+            self.thumbnail.url,
+        )
+        if key in self._rendered:
+            return self._rendered[key]
+        if any(cached[0] != self.current_track for cached in self._rendered):
+            self._rendered.clear()
+
+        query = self.current_track or description
+        metadata = SongMetadata(query, self.itunes, self.metadata_cache)
+        if not wait and metadata.cached_artwork is None:
+            embed = self.build_player_embed(status, description, color, False)
+            return embed, not self.thumbnail.url
+
         artwork = await metadata.artwork
         if not artwork:
-            logger.warning(
-                f"No metadata found for {self.current_track or description}."
-            )
-        self.placeholder = not artwork
+            logger.warning(f"No metadata found for {query}.")
+
+        embed = self.build_player_embed(status, description, color, artwork)
+        rendered = (embed, not artwork and not self.thumbnail.url)
+        if not self.metadata_cache.failed(query):
+            self._rendered[key] = rendered
+        return rendered
 
+    def build_player_embed(
+        self,
+        status: str,
+        description: Optional[str],
+        color: discord.Color,
+        artwork: str | False,
+    ) -> discord.Embed:
         embed = discord.Embed(title="🎵 Radio ATAC Controls", color=color)
         embed.add_field(
             name=status,
@@ -145,66 +2012,452 @@ class RadioBot:
             inline=False,
         )
         embed.set_footer(text="❤️🧡 Radio ATAC • Musica della città ❤️🧡")
-        embed.set_thumbnail(url=artwork or f"attachment://{self.file.filename}")
+        embed.set_thumbnail(url=artwork or self.thumbnail.thumbnail)
         return embed
 
-    async def update_all_player_messages(
-        self,
-        track_name: str,
-        status: str = "Now Playing",
-        color: discord.Color = discord.Color.green(),
-    ) -> None:
-        update_tasks = []
+    async def update_all_player_messages(self) -> None:
+        await asyncio.gather(
+            *(session.update_player_messages() for session in self.sessions.values()),
+            return_exceptions=True,
+        )
+
+    def get_session(self, guild_id: int) -> GuildSession:
+        session = self.sessions.get(guild_id)
+        if session is None:
+            session = self.sessions[guild_id] = GuildSession(self, guild_id)
+        return session
+
+    def _on_player_edited(self, message: Message, payload: dict[str, Any]) -> None:
+        self.thumbnail.remember(message, uploaded=bool(payload.get("attachments")))
+
+    def _forget_message(self, message: Message) -> None:
+        self.views.discard(message.id)
+        for session in self.sessions.values():
+            if session.player_message and session.player_message.id == message.id:
+                session.player_message = None
+                self.save_player_messages()
+
+    def restore_player_messages(self) -> None:
+        """Re-attach each guild's public player.
+
+        The bot isn't in voice after a restart, so the players are restored as
+        stopped and track changes don't claim the radio is playing.
+        """
+        for guild_id, (channel_id, message_id) in self.player_store.load().items():
+            channel = self.bot.get_partial_messageable(channel_id, guild_id=guild_id)
+            session = self.get_session(guild_id)
+            session.player_message = channel.get_partial_message(message_id)
+            session.set_state(
+                "Stopped", discord.Color.red(), "Disconnected from voice channel"
+            )
+        logger.info("Persistent player messages restored.")
+
+    def save_player_messages(self) -> None:
+        self.player_store.save(
+            {
+                guild_id: (session.player_message.channel.id, session.player_message.id)
+                for guild_id, session in self.sessions.items()
+                if session.player_message
+            }
+        )
 
-        for view in list(self.active_views):
+    async def publish_player(
+        self, session: GuildSession, channel: discord.abc.Messageable
+    ) -> discord.Message | discord.PartialMessage:
+        """Edit the guild's public player in place, or post it if there is none."""
+        embed = await self.create_player_embed(*session.state, wait=False)
+        if session.player_message:
+            attachments = [self.thumbnail.file()] if self.placeholder else MISSING
             try:
-                if view.message:
-                    embed = await self.create_player_embed(
-                        status=status, description=track_name, color=color
-                    )
-                    update_tasks.append(
-                        view.message.edit(
-                            embed=embed,
-                            attachments=[self.file] if self.placeholder else MISSING,
-                        )
-                    )
-            except (discord.NotFound, AttributeError):
-                self.active_views.discard(view)
-                continue
+                message = await session.player_message.edit(
+                    embed=embed, attachments=attachments, view=self.persistent_view
+                )
+                self.thumbnail.remember(message, uploaded=bool(attachments))
+                self.edit_scheduler.remember(
+                    session.player_message, embed=embed, attachments=attachments
+                )
+                return session.player_message
+            except discord.NotFound:
+                session.player_message = None
+
+        file = self.thumbnail.file() if self.placeholder else MISSING
+        session.player_message = await channel.send(
+            embed=embed, file=file, view=self.persistent_view
+        )
+        self.thumbnail.remember(session.player_message, uploaded=bool(file))
+        self.edit_scheduler.remember(
+            session.player_message,
+            embed=embed,
+            attachments=[file] if file else MISSING,
+        )
+        self.save_player_messages()
+        return session.player_message
+
+    async def send_player(self, interaction: Interaction) -> None:
+        """Answer with the player right away and patch in the artwork later.
+
+        The first response is rendered from cached state only, so a slow
+        iTunes lookup can't push it past the interaction deadline.
+        """
+        session = self.get_session(interaction.guild.id)
+
+        if self.bot.config.persistent_player:
+            if not interaction.response.is_done():
+                await interaction.response.defer(ephemeral=True, thinking=True)
+                self.observe_response(interaction)
+            message = await self.publish_player(session, interaction.channel)
+            await interaction.followup.send(
+                f"Radio controls: {message.jump_url}", ephemeral=True
+            )
+        else:
+            view = RadioControlView(self)
+            embed = await self.create_player_embed(*session.state, wait=False)
+            file = self.thumbnail.file() if self.placeholder else MISSING
+            if interaction.response.is_done():
+                view.message = await interaction.followup.send(
+                    embed=embed, file=file, view=view, ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    embed=embed, file=file, view=view, ephemeral=True
+                )
+                self.observe_response(interaction)
+                view.message = await interaction.original_response()
+            self.thumbnail.remember(view.message, uploaded=bool(file))
+            self.edit_scheduler.remember(
+                view.message, embed=embed, attachments=[file] if file else MISSING
+            )
+            self.views.register(interaction.guild.id, view, interaction)
+
+        # Edits that wouldn't change anything are skipped by the scheduler.
+        self.spawn(session.update_player_messages())
+
+    def observe_response(self, interaction: Interaction) -> None:
+        """Record the time from an interaction's creation to our first response."""
+        delay = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        self.response_latency.observe(max(0.0, delay))
+
+    def update_presence(self, track_name: Optional[str] = None) -> None:
+        self.presence.update(track_name or self.current_track)
+
+    async def get_ingest(self) -> Optional[StationIngest]:
+        async with self._ingest_lock:
+            if self.ingest and self.ingest.running:
+                return self.ingest
+
+            await self.get_dynamic_url()
+            if not self.stream_url:
+                return None
+
+            # Whatever is left from before the last stop is stale by now.
+            self.ring.discard()
+            self.ingest = self._create_ingest()
+            self.ring.set_writer(self.ingest)
+            await self.ingest.start()
+            return self.ingest
+
+    def _create_ingest(self, codec: Optional[str] = None) -> StationIngest:
+        return StationIngest(
+            self.stream_url,
+            self.ring,
+            self.ffmpeg_options,
+            mode=self.bot.config.audio_mode,
+            bitrate=self.bot.config.audio_bitrate,
+            session=self.session,
+            on_title=self._on_stream_title,
+            on_exit=self._on_ingest_exit,
+            codec=codec,
+        )
+
+    async def switch_ingest(self, reason: str) -> bool:
+        """Replace the station ingest without a break in the ring.
+
+        The replacement pulls the next healthy mirror while the current ingest
+        keeps publishing; once its first frame is read the ring is handed over
+        to it between two frames and the old ingest is stopped. The license is
+        only fetched again once the cached copy is stale.
+        """
+        if self._ingest_lock.locked():
+            return False
+
+        async with self._ingest_lock:
+            started = time.monotonic()
+            old = self.ingest
+            logger.warning(f"Station ingest {reason}, switching to a new source.")
+            replacement: Optional[StationIngest] = None
+            try:
+                self.mirrors.fail()
+                await self.get_dynamic_url()
+                # Skip the codec probe when pulling the same URL again.
+                codec = old.codec if old and old.stream_url == self.stream_url else None
+                replacement = self._create_ingest(codec)
+                await replacement.start()
+                if not await replacement.wait_ready(IngestWatchdog.START_TIMEOUT):
+                    raise RuntimeError("no audio from the new source")
+            except Exception as e:
+                if replacement:
+                    replacement.stop()
+                logger.error(f"Failed to switch station ingest: {e}")
+                return False
+
+            gap = time.monotonic() - self.ring.published_at
+            self.ring.set_writer(replacement)
+            self.ingest = replacement
+            if old:
+                old.stop()
+
+            self.recoveries += 1
+            self.recovery_time.observe(time.monotonic() - started)
+            self.recovery_gap.observe(gap)
+            logger.info(
+                f"Station ingest switched in {(time.monotonic() - started) * 1000:.0f} ms"
+                f" after {gap * 1000:.0f} ms without audio."
+            )
+            return True
 
-        if update_tasks:
-            await asyncio.gather(*update_tasks, return_exceptions=True)
+    def _on_stream_title(self, track_name: str) -> None:
+        self.spawn(self.track_info_updater.set_track(track_name))
 
-    async def update_presence(self, track_name: Optional[str] = None) -> None:
-        if not self.bot.is_ready():
+    def spawn(self, coro: Any) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        session = self.sessions.get(member.guild.id)
+        if not session or not session.voice_client:
             return
 
-        track_name = track_name or self.current_track
+        vc = session.voice_client
+        if (
+            member.id == self.bot.user.id
+            and after.channel is None
+            and vc.is_connected()
+            and session.phase in (session.PLAYING, session.PAUSED)
+        ):
+            # Our own disconnects and discord.py's reconnects tear the
+            # connection down before the gateway confirms it, so still being
+            # connected here means someone else removed the bot.
+            logger.info(f"Removed from voice in guild {session.guild_id}.")
+            self.spawn(self.stop_stream(vc))
+            return
 
-        activity = discord.Activity(
-            type=discord.ActivityType.listening,
-            name=f"{track_name}",
-            state="📻 Radio ATAC",
-            details="🎶 Musica della città",
+        channel_ids = {
+            getattr(before.channel, "id", None),
+            getattr(after.channel, "id", None),
+        }
+        if member.id == self.bot.user.id or session.channel_id in channel_ids:
+            session.count_listeners()
+            self.update_demand()
+
+    def update_demand(self) -> None:
+        """Pull the station only while someone is listening somewhere.
+
+        Guilds that were soft-stopped with people still in the channel keep
+        it running too, so a resume starts at the live edge straight away.
+        """
+        if self.has_demand:
+            if not self.ingest or self.ingest.stopped:
+                logger.info("Listeners are back, restarting the station ingest.")
+                self.spawn(self.get_ingest())
+                self.track_info_updater.wake()
+        elif self.ingest and self.ingest.running:
+            logger.info("Nobody is listening, stopping the station ingest.")
+            self.ingest.stop()
+
+    @property
+    def has_demand(self) -> bool:
+        warm = any(s.soft_stopped and s.listeners for s in self.sessions.values())
+        return bool(self.listener_count or warm)
+
+    def _on_ingest_exit(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._restart_ingest(), self.bot.loop)
+
+    async def _restart_ingest(self) -> None:
+        # The station never ends on its own, so an exit means the mirror failed.
+        # If a switch is already under way the watchdog retries once it's done.
+        # Without listeners the next play starts a fresh ingest instead.
+        if self.has_demand:
+            await self.switch_ingest("ended")
+
+    @property
+    def upstreams(self) -> tuple[Upstream, ...]:
+        return self.license, self.titles, self.itunes
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "upstreams": {u.name: u.stats() for u in self.upstreams},
+            "sessions": {
+                "phases": [session.phase for session in self.sessions.values()],
+                "coalesced": sum(s.coalesced for s in self.sessions.values()),
+            },
+            "resolver": self.stream_resolver.stats(),
+            "mirrors": self.mirrors.stats(),
+            "metadata_cache": self.metadata_cache.stats(),
+            "message_edits": self.edit_scheduler.stats(),
+            "presence": self.presence.stats(),
+            "interaction_response": self.response_latency.snapshot(),
+            "views": self.views.stats(),
+            "placeholder_uploads": self.thumbnail.uploads,
+            "track_info": (
+                self.track_info_updater.stats() if self.track_info_updater else None
+            ),
+            "ingest": self.ingest.stats() if self.ingest else None,
+            "recovery": {
+                **self.watchdog.stats(),
+                "recoveries": self.recoveries,
+                "switch": self.recovery_time.snapshot(),
+                "gap": self.recovery_gap.snapshot(),
+            },
+            "voice": {
+                **self.voice_supervisor.stats(),
+                "gap": (
+                    self.multiplexer.voice_gap.snapshot() if self.multiplexer else None
+                ),
+            },
+            "multiplexer": self.multiplexer.stats() if self.multiplexer else None,
+        }
+
+    @property
+    def listener_count(self) -> int:
+        """People in voice channels the bot is currently streaming to."""
+        return sum(
+            session.listeners
+            for session in self.sessions.values()
+            if session.voice_client and self.is_playing(session.voice_client)
         )
 
-        await self.bot.change_presence(activity=activity)
+    def is_playing(self, voice_client: VoiceClient) -> bool:
+        return bool(self.multiplexer and self.multiplexer.is_subscribed(voice_client))
+
+    async def join_and_play(self, channel: VoiceChannel) -> bool:
+        """Connect to ``channel`` unless already connected, then start streaming."""
+        session = self.get_session(channel.guild.id)
+
+        async def action() -> bool:
+            voice_client = channel.guild.voice_client
+            if voice_client is None:
+                session.phase = session.CONNECTING
+                try:
+                    voice_client = await channel.connect()
+                except Exception:
+                    session.phase = session.IDLE
+                    raise
+            return await self._play(session, voice_client)
+
+        return await session.transition("play", action)
+
+    async def reconnect(
+        self, session: GuildSession, channel: VoiceChannel, timeout: float
+    ) -> bool:
+        """Replace the dropped voice client of a playing guild with a new one.
+
+        Returns whether a new client was attached; pausing or stopping the
+        guild in the meantime makes this a no-op.
+        """
+
+        async def action() -> bool:
+            stale = session.voice_client
+            if session.phase != session.PLAYING or not stale or stale.is_connected():
+                return False
+            await stale.disconnect(force=True)
+            voice_client = await channel.connect(timeout=timeout)
+            return await self._play(session, voice_client)
+
+        return await session.transition("reconnect", action)
 
     async def play_stream(self, voice_client: VoiceClient) -> bool:
-        await self.get_dynamic_url()
-        if self.stream_url:
-            ffmpeg_options = {
-                "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
-                "options": "-vn -b:a 192k",
-            }
-            voice_client.stop()
-            voice_client.play(
-                discord.FFmpegPCMAudio(self.stream_url, **ffmpeg_options),
-                after=lambda e: logger.error(f"Stream error: {e}") if e else None,
-            )
-            await self.update_presence()
+        session = self.get_session(voice_client.guild.id)
+        return await session.transition(
+            "play", lambda: self._play(session, voice_client)
+        )
+
+    async def pause_stream(self, voice_client: VoiceClient) -> None:
+        """Stop sending audio to a guild without touching the shared ingest.
+
+        Nothing is buffered per guild while paused; the ring keeps overwriting
+        its fixed slots, so a resume continues at the live edge.
+        """
+        session = self.get_session(voice_client.guild.id)
+        await session.transition("pause", lambda: self._pause(session, voice_client))
+
+    async def stop_stream(self, voice_client: VoiceClient, soft: bool = False) -> None:
+        """Stop streaming to a guild.
+
+        A soft stop with ``SOFT_STOP_TIMEOUT`` set only stops sending audio and
+        keeps the voice connection warm for that long, so a resume inside the
+        window skips the reconnect and voice handshake.
+        """
+        session = self.get_session(voice_client.guild.id)
+        soft = soft and bool(self.bot.config.soft_stop_timeout)
+        await session.transition(
+            "soft_stop" if soft else "stop",
+            lambda: self._stop(session, voice_client, soft),
+        )
+
+    async def _play(self, session: GuildSession, voice_client: VoiceClient) -> bool:
+        if session.phase == session.PLAYING and self.is_playing(voice_client):
             return True
-        return False
+        if not await self.get_ingest():
+            session.phase = (
+                session.PAUSED if voice_client.is_connected() else session.IDLE
+            )
+            return False
+
+        session.voice_client = voice_client
+        session.cancel_soft_stop()
+        await self.multiplexer.subscribe(voice_client)
+        session.phase = session.PLAYING
+        session.count_listeners()
+        self.update_demand()
+        session.set_state("Now Playing", discord.Color.green())
+        self.spawn(session.update_player_messages())
+        self.update_presence()
+        return True
+
+    async def _pause(self, session: GuildSession, voice_client: VoiceClient) -> None:
+        if session.phase != session.PLAYING:
+            return
+        await self.multiplexer.unsubscribe(voice_client)
+        session.phase = session.PAUSED
+        self.update_demand()
+        session.set_state("Paused", discord.Color.orange())
+        self.spawn(session.update_player_messages())
+
+    async def _stop(
+        self, session: GuildSession, voice_client: VoiceClient, soft: bool
+    ) -> None:
+        if session.phase == session.IDLE and not voice_client.is_connected():
+            return
+        await self.multiplexer.unsubscribe(voice_client)
+
+        if soft and voice_client.is_connected():
+            session.soft_stop(self.bot.config.soft_stop_timeout)
+            session.phase = session.PAUSED
+            self.update_demand()
+            session.set_state("Stopped", discord.Color.red())
+            self.spawn(session.update_player_messages())
+            return
+
+        session.phase = session.DISCONNECTING
+        session.cancel_soft_stop()
+        try:
+            await voice_client.disconnect()
+        finally:
+            session.voice_client = None
+            session.phase = session.IDLE
+        session.count_listeners()
+        self.update_demand()
+        session.set_state(
+            "Stopped", discord.Color.red(), "Disconnected from voice channel"
+        )
+        self.spawn(session.update_player_messages())
 
     async def start_stream(self, interaction: Interaction) -> bool:
         if not isinstance(interaction.guild, Guild):
@@ -222,16 +2475,7 @@ class RadioBot:
 
         if interaction.guild.voice_client:
             if interaction.guild.voice_client.channel == interaction.user.voice.channel:
-                view = RadioControlView(self)
-                embed = await self.create_player_embed()
-                await interaction.response.send_message(
-                    embed=embed,
-                    file=self.file if self.placeholder else MISSING,
-                    view=view,
-                    ephemeral=True,
-                )
-                view.message = await interaction.original_response()
-                self.active_views.add(view)
+                await self.send_player(interaction)
                 logger.info("Sent radio controls for existing stream.")
                 return True
             else:
@@ -243,6 +2487,7 @@ class RadioBot:
                 return False
 
         await interaction.response.defer()
+        self.observe_response(interaction)
         voice_channel = interaction.user.voice.channel
         if not isinstance(voice_channel, VoiceChannel):
             await interaction.followup.send(
@@ -250,18 +2495,8 @@ class RadioBot:
             )
             return False
 
-        voice_client = await voice_channel.connect()
-        if await self.play_stream(voice_client):
-            view = RadioControlView(self)
-            embed = await self.create_player_embed()
-            message = await interaction.followup.send(
-                embed=embed,
-                file=self.file if self.placeholder else MISSING,
-                view=view,
-                ephemeral=True,
-            )
-            view.message = message
-            self.active_views.add(view)
+        if await self.join_and_play(voice_channel):
+            await self.send_player(interaction)
             logger.info(f"Radio stream started in channel: {voice_channel.name}")
             return True
         else:
@@ -273,67 +2508,370 @@ class RadioBot:
 
 
 class TrackInfoUpdater:
+    """Keeps ``current_track`` up to date.
+
+    Titles normally arrive in-band through ICY metadata. When they don't, the
+    ``textUrl`` endpoint is polled with conditional requests on an interval
+    that adapts to the expected end of the current track and to whether
+    anyone is listening.
+    """
+
+    DEFAULT_INTERVAL: float = 5
+    MIN_INTERVAL: float = 2
+    MAX_INTERVAL: float = 30
+    IDLE_INTERVAL: float = 60
+    NEAR_END: float = 10
+
     def __init__(self, radio_bot: RadioBot) -> None:
         self.radio_bot = radio_bot
 
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._validated_url: Optional[str] = None
+        self._last_poll: Optional[float] = None
+        self._track_started: Optional[float] = None
+        self._track_duration: Optional[float] = None
+
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.not_modified = 0
+        self.changes = 0
+        self.detection_latency = LatencyStats()
+
     async def fetch_track_name(self) -> str:
         if not self.radio_bot.track_name_url:
             return "Unknown Track"
-        async with self.radio_bot.session.get(
-            f"https://play5.newradio.it{self.radio_bot.track_name_url}"
-        ) as response:
-            response.raise_for_status()
-            data = await response.text()
-            parsed_data = urllib.parse.parse_qs(data)
-            track_name = parsed_data.get("title", ["Unknown Track"])[0]
-            return track_name
 
-    @tasks.loop(seconds=5)
+        url = f"https://play5.newradio.it{self.radio_bot.track_name_url}"
+        headers = {}
+        if url == self._validated_url:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        async def request(session: aiohttp.ClientSession) -> str:
+            self.requests += 1
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    self.not_modified += 1
+                    return self.radio_bot.current_track
+
+                response.raise_for_status()
+                self._validated_url = url
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+
+                data = await response.text()
+                parsed_data = urllib.parse.parse_qs(data)
+                return parsed_data.get("title", ["Unknown Track"])[0]
+
+        try:
+            return await self.radio_bot.titles.call(request)
+        except CircuitOpenError:
+            # Keep showing the last known title until the endpoint recovers.
+            return self.radio_bot.current_track
+
+    async def fetch_duration(self, track_name: str) -> Optional[float]:
+        song = await SongMetadata(
+            track_name, self.radio_bot.itunes, self.radio_bot.metadata_cache
+        ).get_song()
+        if not song or not song.get("trackTimeMillis"):
+            return None
+        return song["trackTimeMillis"] / 1000
+
+    async def set_track(self, track_name: str) -> None:
+        if track_name == self.radio_bot.current_track:
+            return
+        self.radio_bot.prefetch_artwork(track_name)
+        self.radio_bot.current_track = track_name
+
+        self.radio_bot.update_presence(track_name)
+        await self.radio_bot.update_all_player_messages()
+        logger.info(f"Updated track name to: {track_name}")
+
+    def next_interval(self) -> float:
+        ingest = self.radio_bot.ingest
+        if ingest and ingest.running and ingest.icy:
+            return self.IDLE_INTERVAL
+        if not self.radio_bot.listener_count:
+            return self.IDLE_INTERVAL
+        if not self._track_started or not self._track_duration:
+            return self.DEFAULT_INTERVAL
+
+        elapsed = time.monotonic() - self._track_started
+        remaining = self._track_duration - elapsed
+        if remaining <= self.NEAR_END:
+            return self.MIN_INTERVAL
+        return min(self.MAX_INTERVAL, max(self.MIN_INTERVAL, remaining - self.NEAR_END))
+
+    def stats(self) -> dict[str, Any]:
+        uptime = time.monotonic() - self.started_at
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "changes": self.changes,
+            "fixed_5s_requests": int(uptime / 5),
+            "interval_s": round(self.update_track_name.seconds, 1),
+            "detection_latency": self.detection_latency.snapshot(),
+        }
+
+    def wake(self) -> None:
+        """Poll right away instead of waiting out the idle interval."""
+        if self.update_track_name.is_running():
+            self.update_track_name.restart()
+
+    @tasks.loop(seconds=DEFAULT_INTERVAL)
     async def update_track_name(self) -> None:
+        # In-band ICY titles arrive with the audio; polling is only a fallback,
+        # and nobody needs a title while nobody listens.
+        ingest = self.radio_bot.ingest
+        if (
+            ingest and ingest.running and ingest.icy
+        ) or not self.radio_bot.listener_count:
+            self.update_track_name.change_interval(seconds=self.next_interval())
+            return
+
+        polled_at = time.monotonic()
         try:
             track_name = await self.fetch_track_name()
             if track_name != self.radio_bot.current_track:
-                self.radio_bot.current_track = track_name
-
-                await asyncio.gather(
-                    self.radio_bot.update_presence(track_name),
-                    self.radio_bot.update_all_player_messages(track_name),
-                    return_exceptions=True,
-                )
-                logger.info(f"Updated track name to: {track_name}")
+                # The change happened at some point since the previous poll.
+                if self._last_poll:
+                    self.detection_latency.observe(polled_at - self._last_poll)
+                self.changes += 1
+                self._track_started = polled_at
+                self._track_duration = None
+                await self.set_track(track_name)
+                self._track_duration = await self.fetch_duration(track_name)
+            self._last_poll = polled_at
         except Exception as e:
             logger.error(f"Error updating track name: {e}")
+        finally:
+            self.update_track_name.change_interval(seconds=self.next_interval())
 
     def start_updater(self) -> None:
         self.update_track_name.start()
 
 
-class RadioControlView(View):
+class IngestWatchdog:
+    """Replaces the station ingest when frames stop arriving or fall behind.
+
+    The ring is checked every ``INTERVAL`` seconds. The ingest counts as
+    stalled once no frame was published for ``STALL_TIMEOUT`` seconds, and as
+    too slow once fewer than ``MIN_RATE`` of the expected frames arrived over
+    the last ``WINDOW`` seconds. A failed switch is retried after ``COOLDOWN``.
+    """
+
+    INTERVAL: float = 0.1
+    STALL_TIMEOUT: float = 0.5
+    WINDOW: float = 3.0
+    MIN_RATE: float = 0.8
+    COOLDOWN: float = 2.0
+    START_TIMEOUT: float = 5.0
+
     def __init__(self, radio_bot: RadioBot) -> None:
-        super().__init__(timeout=None)
+        self.radio_bot = radio_bot
+
+        self._ingest: Optional[StationIngest] = None
+        self._samples: deque[tuple[float, int]] = deque()
+        self._retry_at = 0.0
+
+        self.stalls = 0
+        self.slow = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"stalls": self.stalls, "slow": self.slow}
+
+    def reason(self, ingest: StationIngest, now: float) -> Optional[str]:
+        ring = self.radio_bot.ring
+        if ingest is not self._ingest:
+            self._ingest = ingest
+            self._samples.clear()
+        if ingest.failed:
+            stalled = True
+        elif not ingest.ready:
+            stalled = now - ingest.started_at > self.START_TIMEOUT
+        else:
+            stalled = now - ring.published_at > self.STALL_TIMEOUT
+        if stalled:
+            self.stalls += 1
+            return "stalled"
+        if not ingest.ready:
+            return None
+
+        self._samples.append((now, ring.sequence))
+        while self._samples[0][0] < now - self.WINDOW:
+            self._samples.popleft()
+        started, sequence = self._samples[0]
+        elapsed = now - started
+        if elapsed < self.WINDOW - self.INTERVAL * 2:
+            return None
+
+        expected = elapsed * 1000 / discord.opus.Encoder.FRAME_LENGTH
+        if ring.sequence - sequence < expected * self.MIN_RATE:
+            self.slow += 1
+            return "too slow"
+        return None
+
+    @tasks.loop(seconds=INTERVAL)
+    async def check(self) -> None:
+        ingest = self.radio_bot.ingest
+        now = time.monotonic()
+        if not ingest or ingest.stopped or now < self._retry_at:
+            return
+        # A failed ingest is left alone while nobody listens; it is replaced
+        # once demand returns.
+        if not self.radio_bot.has_demand:
+            return
+
+        reason = self.reason(ingest, now)
+        if reason and not await self.radio_bot.switch_ingest(reason):
+            self._retry_at = time.monotonic() + self.COOLDOWN
+
+    def start_watchdog(self) -> None:
+        self.check.start()
+
+
+class VoiceSupervisor:
+    """Brings back the voice connections of guilds that are still playing.
+
+    discord.py resumes short voice websocket drops on its own, so a guild is
+    only taken over once its voice client has been down for ``GRACE`` seconds
+    or was given up on. It is then reconnected to the same channel with
+    jittered exponential backoff and subscribed to the multiplexer again,
+    which carries on at the live edge of the ring. After ``MAX_ATTEMPTS``
+    failed attempts, or once the channel is gone, the guild is stopped.
+    """
+
+    INTERVAL: float = 0.5
+    GRACE: float = 2.0
+    BACKOFF: float = 0.5
+    MAX_BACKOFF: float = 30.0
+    MAX_ATTEMPTS: int = 10
+    CONNECT_TIMEOUT: float = 10.0
+
+    def __init__(self, radio_bot: RadioBot) -> None:
+        self.radio_bot = radio_bot
+
+        self._down_since: dict[int, float] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+        self.drops = 0
+        self.attempts = 0
+        self.reconnects = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "drops": self.drops,
+            "attempts": self.attempts,
+            "reconnects": self.reconnects,
+            "reconnecting": len(self._tasks),
+        }
+
+    @tasks.loop(seconds=INTERVAL)
+    async def check(self) -> None:
+        now = time.monotonic()
+        for guild_id, session in list(self.radio_bot.sessions.items()):
+            vc = session.voice_client
+            if (
+                guild_id in self._tasks
+                or session.phase != session.PLAYING
+                or not vc
+                or vc.is_connected()
+            ):
+                self._down_since.pop(guild_id, None)
+                continue
+
+            down_since = self._down_since.setdefault(guild_id, now)
+            given_up = vc.guild.voice_client is not vc
+            if given_up or now - down_since >= self.GRACE:
+                del self._down_since[guild_id]
+                self.drops += 1
+                task = asyncio.create_task(self.supervise(session, vc.channel))
+                self._tasks[guild_id] = task
+                task.add_done_callback(lambda _, g=guild_id: self._tasks.pop(g, None))
+
+    async def supervise(self, session: GuildSession, channel: VoiceChannel) -> None:
+        logger.warning(
+            f"Voice connection in guild {session.guild_id} dropped, reconnecting."
+        )
+        attempt = 0
+        while True:
+            self.attempts += 1
+            try:
+                if await self.radio_bot.reconnect(
+                    session, channel, self.CONNECT_TIMEOUT
+                ):
+                    self.reconnects += 1
+                    logger.info(f"Voice in guild {session.guild_id} restored.")
+                return
+            except Exception as e:
+                logger.warning(
+                    f"Voice reconnect in guild {session.guild_id} failed: {e}"
+                )
+
+            attempt += 1
+            gone = channel.guild.get_channel(channel.id) is None
+            if gone or attempt >= self.MAX_ATTEMPTS:
+                logger.error(f"Giving up on voice in guild {session.guild_id}.")
+                if session.voice_client:
+                    await self.radio_bot.stop_stream(session.voice_client)
+                return
+
+            delay = min(self.MAX_BACKOFF, self.BACKOFF * 2 ** (attempt - 1))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    def start_supervisor(self) -> None:
+        self.check.start()
+
+    def stop(self) -> None:
+        self.check.cancel()
+        for task in self._tasks.values():
+            task.cancel()
+
+
+class MetricsReporter:
+    def __init__(self, radio_bot: RadioBot) -> None:
+        self.radio_bot = radio_bot
+
+    @tasks.loop(seconds=60)
+    async def report(self) -> None:
+        logger.info(f"Metrics: {self.radio_bot.metrics()}")
+
+    def start_reporter(self) -> None:
+        self.report.start()
+
+
+class RadioControlView(View):
+    # Idle views are released from the view store, and with it from the registry.
+    # Their buttons keep working through the persistent view registered at setup.
+    TIMEOUT: float = 60 * 60
+
+    def __init__(self, radio_bot: RadioBot, persistent: bool = False) -> None:
+        # Persistent views never time out so they survive for the life of the process.
+        super().__init__(timeout=None if persistent else self.TIMEOUT)
         self.radio_bot = radio_bot
         self.message: Optional[Message] = None
 
-    @discord.ui.button(label="", style=ButtonStyle.primary, emoji="⏸️")
+    @discord.ui.button(
+        label="", style=ButtonStyle.primary, emoji="⏸️", custom_id="radio:pause"
+    )
     async def pause_button(self, interaction: Interaction, button: Button) -> None:
         if not isinstance(interaction.guild, Guild):
             return
 
-        if (
-            interaction.guild.voice_client
-            and interaction.guild.voice_client.is_playing()
-        ):
-            interaction.guild.voice_client.pause()
-
-            await self.radio_bot.update_all_player_messages(
-                self.radio_bot.current_track,
-                status="Paused",
-                color=discord.Color.orange(),
-            )
+        vc = interaction.guild.voice_client
+        if vc and self.radio_bot.is_playing(vc):
+            # Acknowledge first: the transition may wait behind a slow connect.
             await interaction.response.defer()
+            self.radio_bot.observe_response(interaction)
+            await self.radio_bot.pause_stream(vc)
             logger.info("Radio paused.")
 
-    @discord.ui.button(label="", style=ButtonStyle.success, emoji="⏯️")
+    @discord.ui.button(
+        label="", style=ButtonStyle.success, emoji="⏯️", custom_id="radio:resume"
+    )
     async def resume_button(self, interaction: Interaction, button: Button) -> None:
         if not isinstance(interaction.guild, Guild):
             return
@@ -352,55 +2890,43 @@ class RadioControlView(View):
                 )
                 return
             await interaction.response.defer()
+            self.radio_bot.observe_response(interaction)
 
-            vc = await interaction.user.voice.channel.connect()
-            if await self.radio_bot.play_stream(vc):
-                await self.radio_bot.update_all_player_messages(
-                    self.radio_bot.current_track, color=discord.Color.green()
-                )
+            if await self.radio_bot.join_and_play(interaction.user.voice.channel):
                 logger.info("Radio resumed with new connection.")
                 return
 
-        elif vc.is_paused():
-            vc.resume()
-            await self.radio_bot.update_all_player_messages(
-                self.radio_bot.current_track,
-                status="Now Playing",
-                color=discord.Color.green(),
-            )
-            await self.radio_bot.update_presence()
+        elif not self.radio_bot.is_playing(vc):
             await interaction.response.defer()
+            self.radio_bot.observe_response(interaction)
+            await self.radio_bot.play_stream(vc)
             logger.info("Radio resumed.")
         else:
             await interaction.response.defer()
+            self.radio_bot.observe_response(interaction)
             logger.info("Radio already playing.")
 
-    @discord.ui.button(label="", style=ButtonStyle.danger, emoji="⏹️")
+    @discord.ui.button(
+        label="", style=ButtonStyle.danger, emoji="⏹️", custom_id="radio:stop"
+    )
     async def stop_button(self, interaction: Interaction, button: Button) -> None:
         if not isinstance(interaction.guild, Guild):
             return
 
         if interaction.guild.voice_client:
             vc = interaction.guild.voice_client
-            vc.stop()
-            await vc.disconnect()
-
-            # Update all player messages to indicate stopped state
-            await self.radio_bot.update_all_player_messages(
-                "Disconnected from voice channel",
-                status="Stopped",
-                color=discord.Color.red(),
-            )
             await interaction.response.defer()
-            logger.info("Radio stopped and disconnected from voice channel.")
+            self.radio_bot.observe_response(interaction)
+            await self.radio_bot.stop_stream(vc, soft=True)
+            logger.info("Radio stopped.")
 
 
 class Client(discord.Client):
     def __init__(self, *, intents: discord.Intents) -> None:
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
-        self.radio_bot = RadioBot(self)
         self.config = BotConfig()
+        self.radio_bot = RadioBot(self)
 
     async def setup_hook(self) -> None:
         await self.tree.sync(guild=self.config.guild)
@@ -411,6 +2937,14 @@ class Client(discord.Client):
         await self.radio_bot.cleanup()
         await super().close()
 
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        self.radio_bot.on_voice_state_update(member, before, after)
+
     async def on_ready(self) -> None:
         logger.info(f"Logged in as {self.user}")
 
@@ -418,6 +2952,7 @@ class Client(discord.Client):
 def setup_bot() -> Client:
     intents = discord.Intents.default()
     intents.message_content = True
+    intents.voice_states = True
     return Client(intents=intents)
 
 
@@ -443,10 +2978,12 @@ async def leave(interaction: Interaction) -> None:
         return
 
     if interaction.guild.voice_client:
-        await interaction.guild.voice_client.disconnect()
+        vc = interaction.guild.voice_client
         await interaction.response.send_message(
             "Disconnected from the voice channel.", ephemeral=True
         )
+        client.radio_bot.observe_response(interaction)
+        await client.radio_bot.stop_stream(vc)
         logger.info("Disconnected from the voice channel.")
     else:
         await interaction.response.send_message(